@@ -1,402 +1,537 @@
+import io
 import os
+import shutil
+import subprocess
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
-def create_directory(path):
-    os.makedirs(path, exist_ok=True)
+try:
+    import liburing
+except ImportError:
+    liburing = None
 
-def create_file(path, content=""):
-    with open(path, 'w') as f:
-        f.write(content)
+# Directories map to dicts, or to a list when they only hold files;
+# "_files" lists the files that sit beside subdirectories and "_routes"
+# names subdirectories that hold nothing but a route file.
+ROUTE_FILE = "route.ts"
+
+TREE = {
+    "app": {
+        "api": {
+            "_routes": ["health"],
+            "client": {
+                "auth": {
+                    "_routes": [
+                        "register",
+                        "verify-otp",
+                        "login",
+                        "verify-login-otp",
+                        "refresh-token",
+                        "logout",
+                        "resend-otp",
+                    ],
+                    "qr-login": {
+                        "_routes": ["generate", "verify", "status"],
+                    },
+                },
+                "user": {
+                    "_routes": ["profile", "avatar", "status", "search", "online-status"],
+                    "contacts": {
+                        "_routes": ["block", "blocked"],
+                        "_files": [ROUTE_FILE],
+                    },
+                },
+                "privacy": {
+                    "_routes": [
+                        "settings",
+                        "last-seen",
+                        "profile-photo",
+                        "status",
+                        "read-receipts",
+                    ],
+                },
+                "chats": {
+                    "_routes": ["create"],
+                    "[chatId]": {
+                        "_routes": ["typing", "mute", "clear"],
+                        "messages": {
+                            "_routes": ["unread-count", "search"],
+                            "[messageId]": {
+                                "_routes": ["read", "reactions"],
+                            },
+                            "_files": [ROUTE_FILE],
+                        },
+                        "_files": [ROUTE_FILE],
+                    },
+                    "_files": [ROUTE_FILE],
+                },
+                "groups": {
+                    "[groupId]": {
+                        "_routes": ["leave", "avatar", "settings"],
+                        "members": {
+                            "_routes": ["[userId]", "promote", "demote"],
+                            "_files": [ROUTE_FILE],
+                        },
+                        "_files": [ROUTE_FILE],
+                    },
+                    "invite": {
+                        "_routes": ["generate", "join"],
+                    },
+                    "_files": [ROUTE_FILE],
+                },
+                "media": {
+                    "upload": {
+                        "_routes": ["image", "video", "audio", "document", "voice-note"],
+                    },
+                    "download": {
+                        "_routes": ["[fileId]"],
+                    },
+                    "thumbnail": {
+                        "_routes": ["[fileId]"],
+                    },
+                    "delete": {
+                        "_routes": ["[fileId]"],
+                    },
+                },
+                "calls": {
+                    "_routes": ["initiate", "answer", "reject", "end", "turn-credentials"],
+                    "[callId]": {
+                        "_routes": ["ice-candidates", "offer", "answer-sdp"],
+                        "_files": [ROUTE_FILE],
+                    },
+                    "group-call": {
+                        "_routes": ["create", "join"],
+                    },
+                    "_files": [ROUTE_FILE],
+                },
+                "status": {
+                    "_routes": ["my-status", "recent"],
+                    "[statusId]": {
+                        "_routes": ["view", "viewers"],
+                        "_files": [ROUTE_FILE],
+                    },
+                    "_files": [ROUTE_FILE],
+                },
+                "notifications": {
+                    "_routes": ["read", "settings", "push-token"],
+                    "_files": [ROUTE_FILE],
+                },
+                "sync": {
+                    "_routes": ["messages", "chats", "full"],
+                },
+            },
+            "admin": {
+                "auth": {
+                    "_routes": ["login", "logout", "verify"],
+                },
+                "dashboard": {
+                    "_routes": ["stats", "analytics", "system-health"],
+                },
+                "users": {
+                    "_routes": ["search", "bulk-actions", "export"],
+                    "[userId]": {
+                        "_routes": ["ban", "unban", "chats", "activity"],
+                        "_files": [ROUTE_FILE],
+                    },
+                    "_files": [ROUTE_FILE],
+                },
+                "messages": {
+                    "_routes": ["reported", "search", "analytics"],
+                    "[messageId]": {
+                        "_routes": ["flag"],
+                        "_files": [ROUTE_FILE],
+                    },
+                    "_files": [ROUTE_FILE],
+                },
+                "groups": {
+                    "_routes": ["analytics"],
+                    "[groupId]": {
+                        "_routes": ["members", "messages"],
+                        "_files": [ROUTE_FILE],
+                    },
+                    "_files": [ROUTE_FILE],
+                },
+                "media": {
+                    "_routes": ["[fileId]", "storage", "cleanup"],
+                    "_files": [ROUTE_FILE],
+                },
+                "reports": {
+                    "_routes": ["types"],
+                    "[reportId]": {
+                        "_routes": ["resolve"],
+                        "_files": [ROUTE_FILE],
+                    },
+                    "_files": [ROUTE_FILE],
+                },
+                "settings": {
+                    "_routes": ["system", "notifications", "security", "maintenance"],
+                },
+                "logs": {
+                    "_routes": ["errors", "audit", "export"],
+                    "_files": [ROUTE_FILE],
+                },
+                "backup": {
+                    "_routes": ["create", "restore", "list"],
+                },
+            },
+            "webhook": {
+                "_routes": ["smtp", "push-notifications", "payment"],
+            },
+        },
+        "_files": ["globals.css"],
+    },
+    "lib": {
+        "auth": ["jwt.ts", "otp.ts", "qr-auth.ts", "middleware.ts"],
+        "database": {
+            "models": [
+                "user.ts",
+                "chat.ts",
+                "message.ts",
+                "group.ts",
+                "media.ts",
+                "call.ts",
+                "status.ts",
+                "notification.ts",
+                "report.ts",
+                "admin.ts",
+            ],
+            "schemas": [
+                "user.ts",
+                "message.ts",
+                "auth.ts",
+                "media.ts",
+                "group.ts",
+                "call.ts",
+            ],
+            "repositories": [
+                "user.ts",
+                "chat.ts",
+                "message.ts",
+                "group.ts",
+                "media.ts",
+                "call.ts",
+                "status.ts",
+            ],
+            "_files": ["mongodb.ts"],
+        },
+        "realtime": {
+            "events": [
+                "messaging.ts",
+                "presence.ts",
+                "typing.ts",
+                "calls.ts",
+                "groups.ts",
+            ],
+            "middleware": ["auth.ts", "rate-limit.ts"],
+            "_files": ["socket.ts"],
+        },
+        "media": ["s3.ts", "upload.ts", "compression.ts", "thumbnail.ts", "validation.ts"],
+        "communication": {
+            "templates": ["email.ts", "sms.ts"],
+            "_files": ["smtp.ts", "sms.ts", "push-notifications.ts"],
+        },
+        "webrtc": ["coturn.ts", "signaling.ts", "ice-candidates.ts", "call-manager.ts"],
+        "security": [
+            "encryption.ts",
+            "rate-limiting.ts",
+            "validation.ts",
+            "sanitization.ts",
+            "permissions.ts",
+        ],
+        "utils": [
+            "constants.ts",
+            "helpers.ts",
+            "date.ts",
+            "crypto.ts",
+            "pagination.ts",
+            "error-handler.ts",
+        ],
+        "monitoring": ["analytics.ts", "logging.ts", "metrics.ts", "health-check.ts"],
+        "config": [
+            "environment.ts",
+            "database.ts",
+            "redis.ts",
+            "cors.ts",
+            "rate-limits.ts",
+        ],
+    },
+    "_files": ["middleware.ts", "next.config.js", "package.json", "tsconfig.json"],
+}
+
+ROOT = "project-root"
+# Written last, so its presence means a previous run finished the whole tree
+DONE_MARKER = ".scaffold_done"
+
+RING_ENTRIES = 4096
+# Keeps the number of descriptors open at once well under RLIMIT_NOFILE
+OPEN_BATCH = 256
+
+def create_directory(path, dir_fd=None):
+    try:
+        os.mkdir(path, dir_fd=dir_fd)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        # Only reached when a caller skips a parent; os.makedirs has no dir_fd
+        parent = os.path.dirname(path)
+        if not parent:
+            raise
+        create_directory(parent, dir_fd=dir_fd)
+        # Retry once only: a dangling symlink would otherwise recurse forever
+        try:
+            os.mkdir(path, dir_fd=dir_fd)
+        except FileExistsError:
+            pass
+
+def create_file(path, content="", dir_fd=None):
+    fd = os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+    try:
+        # Empty files need no write at all
+        if content:
+            os.write(fd, content.encode() if isinstance(content, str) else content)
+    finally:
+        os.close(fd)
+
+def walk_tree(tree):
+    # TREE is already the prefix trie: walking it breadth-first yields each
+    # directory once, grouped by depth, with every parent in an earlier level
+    join = os.path.join
+    levels = []
+    files = []
+    frontier = [("", tree)]
+    while frontier:
+        level = []
+        next_frontier = []
+        for base, node in frontier:
+            for name, entry in node.items():
+                if name == "_files":
+                    files.extend(join(base, f) for f in entry)
+                    continue
+                if name == "_routes":
+                    # The directory is derived from the route file's path
+                    for route in entry:
+                        path = join(base, route)
+                        level.append(path)
+                        files.append(join(path, ROUTE_FILE))
+                    continue
+                path = join(base, name)
+                level.append(path)
+                if isinstance(entry, dict):
+                    next_frontier.append((path, entry))
+                else:
+                    files.extend(join(path, f) for f in entry)
+        if level:
+            levels.append(level)
+        frontier = next_frontier
+    return levels, files
+
+def _supports_scaffold_ops(ring):
+    # MKDIRAT only arrived in 5.15, so a ring that sets up fine may still
+    # answer every mkdir with EINVAL
+    op = liburing.io_uring_op
+    try:
+        probe = liburing.io_uring_get_probe_ring(ring)
+    except OSError:
+        return False
+    if not probe:
+        return False
+    try:
+        return all(
+            liburing.io_uring_opcode_supported(probe, opcode)
+            for opcode in (op.IORING_OP_MKDIRAT, op.IORING_OP_OPENAT, op.IORING_OP_CLOSE))
+    finally:
+        liburing.io_uring_free_probe(probe)
+
+def _open_ring():
+    # With SQPOLL a kernel thread polls the submission queue, so submitting a
+    # batch is a memory write; SINGLE_ISSUER needs 6.0, so 5.15-5.19 kernels
+    # still get SQPOLL alone, and those that refuse both get a plain ring
+    sqpoll = liburing.IORING_SETUP_SQPOLL
+    for flags in (sqpoll | liburing.IORING_SETUP_SINGLE_ISSUER, sqpoll, 0):
+        ring = liburing.Ring()
+        try:
+            liburing.io_uring_queue_init(RING_ENTRIES, ring, flags)
+        except OSError:
+            continue
+        if not _supports_scaffold_ops(ring):
+            liburing.io_uring_queue_exit(ring)
+            return None
+        return ring
+    return None
+
+def _tagged(sqe, index):
+    sqe.user_data = index
+    return sqe
+
+def _reap_completions(ring, cqe, count):
+    # Completions may arrive out of order, so each SQE carries its batch index
+    # in user_data. Entries are taken one at a time: cqe[i] for i > 0 is not
+    # masked into the ring and would read past its end after a wrap.
+    # Failed completions are returned as the OSError they would have raised.
+    results = [None] * count
+    for _ in range(count):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        entry = cqe[0]
+        try:
+            index = entry.user_data
+            try:
+                results[index] = entry.res
+            except OSError as exc:
+                results[index] = exc
+        finally:
+            liburing.io_uring_cqe_seen(ring, entry)
+    return results
+
+def _with_filename(exc, path):
+    # Errors rebuilt from cqe.res carry no path; name it like os.open would
+    return type(exc)(exc.errno, exc.strerror, path)
+
+def _batch_mkdir(ring, levels, dir_fd):
+    # One submission per depth level; a level only starts once its parents exist
+    get_sqe = liburing.io_uring_get_sqe
+    prep_mkdir = liburing.io_uring_prep_mkdir
+    cqe = liburing.Cqe()
+    for level in levels:
+        for start in range(0, len(level), RING_ENTRIES):
+            batch = level[start:start + RING_ENTRIES]
+            for i, path in enumerate(batch):
+                prep_mkdir(_tagged(get_sqe(ring), i), path, 0o777, dir_fd)
+            liburing.io_uring_submit_and_wait(ring, len(batch))
+            for path, result in zip(batch, _reap_completions(ring, cqe, len(batch))):
+                if isinstance(result, OSError) and not isinstance(result, FileExistsError):
+                    raise _with_filename(result, path)
+
+def _batch_create_empty_files(ring, paths, dir_fd):
+    # Open a batch, then close every descriptor it produced before reporting errors
+    get_sqe = liburing.io_uring_get_sqe
+    prep_open = liburing.io_uring_prep_open
+    prep_close = liburing.io_uring_prep_close
+    cqe = liburing.Cqe()
+    flags = os.O_CREAT | os.O_WRONLY | os.O_TRUNC
+    for start in range(0, len(paths), OPEN_BATCH):
+        batch = paths[start:start + OPEN_BATCH]
+        for i, path in enumerate(batch):
+            prep_open(_tagged(get_sqe(ring), i), path, flags, 0o644, dir_fd)
+        liburing.io_uring_submit_and_wait(ring, len(batch))
+        results = _reap_completions(ring, cqe, len(batch))
+        fds = [result for result in results if not isinstance(result, OSError)]
+        for i, fd in enumerate(fds):
+            prep_close(_tagged(get_sqe(ring), i), fd)
+        liburing.io_uring_submit_and_wait(ring, len(fds))
+        _reap_completions(ring, cqe, len(fds))
+        for path, result in zip(batch, results):
+            if isinstance(result, OSError):
+                raise _with_filename(result, path)
+
+def _extract_with_tar(levels, files, root):
+    # Describe the whole tree as one archive and let tar's C loop create it
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w|") as archive:
+        for level in levels:
+            for path in level:
+                info = tarfile.TarInfo(path)
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o777
+                archive.addfile(info)
+        for path in files:
+            info = tarfile.TarInfo(path)
+            info.mode = 0o644
+            archive.addfile(info)
+    subprocess.run(
+        ["tar", "-x", "-m", "--no-same-owner", "--no-same-permissions",
+         "-f", "-", "-C", root],
+        input=buf.getvalue(), check=True)
+
+def _copy_template(template, root):
+    # Either a pre-built tree whose contents are copied, or an archive of
+    # project-root's contents, e.g. made with "cd project-root && zip -r ../scaffold.zip ."
+    if os.path.isdir(template):
+        # GNU cp shares extents on CoW filesystems; BusyBox and BSD cp reject
+        # --reflink, so any failure falls back to copytree. Both copy symlinks
+        # as symlinks.
+        try:
+            subprocess.run(
+                ["cp", "-R", "--reflink=auto", os.path.join(template, "."), root],
+                check=True)
+        except (subprocess.CalledProcessError, OSError):
+            shutil.copytree(template, root, symlinks=True, dirs_exist_ok=True)
+        return
+    with zipfile.ZipFile(template) as archive:
+        archive.extractall(root)
+
+def build_tree(root, root_fd, levels, files, fresh=False):
+    # The engines in this process resolve paths relative to root_fd rather
+    # than the process cwd; helpers that need a path get root. fresh says
+    # the root was just created and is still empty
+    template = os.environ.get("SCAFFOLD_TEMPLATE")
+    if template:
+        _copy_template(template, root)
+        return
+
+    # tar replaces whatever sits where it wants a directory (regular files,
+    # symlinks) instead of failing like the other engines, so it may only
+    # unpack into a root that holds nothing yet
+    if fresh and os.environ.get("SCAFFOLD_ENGINE") == "tar" and shutil.which("tar"):
+        _extract_with_tar(levels, files, root)
+        return
+
+    ring = _open_ring() if liburing is not None else None
+    if ring is None:
+        # The GIL is released around mkdir/open/close, so threads overlap the
+        # syscalls; directories in one level are independent of each other
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for level in levels:
+                list(pool.map(lambda path: create_directory(path, dir_fd=root_fd), level))
+            list(pool.map(lambda path: create_file(path, dir_fd=root_fd), files))
+        return
+
+    try:
+        _batch_mkdir(ring, levels, root_fd)
+        _batch_create_empty_files(ring, files, root_fd)
+    finally:
+        liburing.io_uring_queue_exit(ring)
 
 def create_project_structure():
-    # Root directory
-    create_directory("project-root")
-    os.chdir("project-root")
+    try:
+        os.stat(os.path.join(ROOT, DONE_MARKER))
+        return
+    except FileNotFoundError:
+        pass
+
+    levels, files = walk_tree(TREE)
+
+    # Root directory; with SCAFFOLD_ATOMIC a fresh tree is built under a
+    # sibling name and published with a single rename, so a failed run never
+    # leaves a half-built project-root behind
+    target = ROOT
+    if os.environ.get("SCAFFOLD_ATOMIC") and not os.path.exists(ROOT):
+        staging_name = ".%s.%d" % (os.path.basename(ROOT), os.getpid())
+        target = os.path.join(os.path.dirname(ROOT), staging_name)
+        os.mkdir(target)
+        fresh = True
+    else:
+        try:
+            os.mkdir(ROOT)
+            fresh = True
+        except FileExistsError:
+            fresh = False
 
-    # App directory and its subdirectories
-    create_directory("app/api/client/auth/register")
-    create_file("app/api/client/auth/register/route.ts")
-    create_directory("app/api/client/auth/verify-otp")
-    create_file("app/api/client/auth/verify-otp/route.ts")
-    create_directory("app/api/client/auth/login")
-    create_file("app/api/client/auth/login/route.ts")
-    create_directory("app/api/client/auth/verify-login-otp")
-    create_file("app/api/client/auth/verify-login-otp/route.ts")
-    create_directory("app/api/client/auth/refresh-token")
-    create_file("app/api/client/auth/refresh-token/route.ts")
-    create_directory("app/api/client/auth/logout")
-    create_file("app/api/client/auth/logout/route.ts")
-    create_directory("app/api/client/auth/qr-login/generate")
-    create_file("app/api/client/auth/qr-login/generate/route.ts")
-    create_directory("app/api/client/auth/qr-login/verify")
-    create_file("app/api/client/auth/qr-login/verify/route.ts")
-    create_directory("app/api/client/auth/qr-login/status")
-    create_file("app/api/client/auth/qr-login/status/route.ts")
-    create_directory("app/api/client/auth/resend-otp")
-    create_file("app/api/client/auth/resend-otp/route.ts")
-    
-    create_directory("app/api/client/user/profile")
-    create_file("app/api/client/user/profile/route.ts")
-    create_directory("app/api/client/user/avatar")
-    create_file("app/api/client/user/avatar/route.ts")
-    create_directory("app/api/client/user/status")
-    create_file("app/api/client/user/status/route.ts")
-    create_directory("app/api/client/user/search")
-    create_file("app/api/client/user/search/route.ts")
-    create_directory("app/api/client/user/contacts/block")
-    create_file("app/api/client/user/contacts/block/route.ts")
-    create_directory("app/api/client/user/contacts/blocked")
-    create_file("app/api/client/user/contacts/blocked/route.ts")
-    create_directory("app/api/client/user/contacts")
-    create_file("app/api/client/user/contacts/route.ts")
-    create_directory("app/api/client/user/online-status")
-    create_file("app/api/client/user/online-status/route.ts")
-    
-    create_directory("app/api/client/privacy/settings")
-    create_file("app/api/client/privacy/settings/route.ts")
-    create_directory("app/api/client/privacy/last-seen")
-    create_file("app/api/client/privacy/last-seen/route.ts")
-    create_directory("app/api/client/privacy/profile-photo")
-    create_file("app/api/client/privacy/profile-photo/route.ts")
-    create_directory("app/api/client/privacy/status")
-    create_file("app/api/client/privacy/status/route.ts")
-    create_directory("app/api/client/privacy/read-receipts")
-    create_file("app/api/client/privacy/read-receipts/route.ts")
-    
-    create_directory("app/api/client/chats/[chatId]/messages/[messageId]/read")
-    create_file("app/api/client/chats/[chatId]/messages/[messageId]/read/route.ts")
-    create_directory("app/api/client/chats/[chatId]/messages/[messageId]/reactions")
-    create_file("app/api/client/chats/[chatId]/messages/[messageId]/reactions/route.ts")
-    create_directory("app/api/client/chats/[chatId]/messages/unread-count")
-    create_file("app/api/client/chats/[chatId]/messages/unread-count/route.ts")
-    create_directory("app/api/client/chats/[chatId]/messages/search")
-    create_file("app/api/client/chats/[chatId]/messages/search/route.ts")
-    create_directory("app/api/client/chats/[chatId]/messages")
-    create_file("app/api/client/chats/[chatId]/messages/route.ts")
-    create_directory("app/api/client/chats/[chatId]/typing")
-    create_file("app/api/client/chats/[chatId]/typing/route.ts")
-    create_directory("app/api/client/chats/[chatId]/mute")
-    create_file("app/api/client/chats/[chatId]/mute/route.ts")
-    create_directory("app/api/client/chats/[chatId]/clear")
-    create_file("app/api/client/chats/[chatId]/clear/route.ts")
-    create_directory("app/api/client/chats/[chatId]")
-    create_file("app/api/client/chats/[chatId]/route.ts")
-    create_directory("app/api/client/chats/create")
-    create_file("app/api/client/chats/create/route.ts")
-    create_directory("app/api/client/chats")
-    create_file("app/api/client/chats/route.ts")
-    
-    create_directory("app/api/client/groups/[groupId]/members/[userId]")
-    create_file("app/api/client/groups/[groupId]/members/[userId]/route.ts")
-    create_directory("app/api/client/groups/[groupId]/members/promote")
-    create_file("app/api/client/groups/[groupId]/members/promote/route.ts")
-    create_directory("app/api/client/groups/[groupId]/members/demote")
-    create_file("app/api/client/groups/[groupId]/members/demote/route.ts")
-    create_directory("app/api/client/groups/[groupId]/members")
-    create_file("app/api/client/groups/[groupId]/members/route.ts")
-    create_directory("app/api/client/groups/[groupId]/leave")
-    create_file("app/api/client/groups/[groupId]/leave/route.ts")
-    create_directory("app/api/client/groups/[groupId]/avatar")
-    create_file("app/api/client/groups/[groupId]/avatar/route.ts")
-    create_directory("app/api/client/groups/[groupId]/settings")
-    create_file("app/api/client/groups/[groupId]/settings/route.ts")
-    create_directory("app/api/client/groups/[groupId]")
-    create_file("app/api/client/groups/[groupId]/route.ts")
-    create_directory("app/api/client/groups/invite/generate")
-    create_file("app/api/client/groups/invite/generate/route.ts")
-    create_directory("app/api/client/groups/invite/join")
-    create_file("app/api/client/groups/invite/join/route.ts")
-    create_directory("app/api/client/groups")
-    create_file("app/api/client/groups/route.ts")
-    
-    create_directory("app/api/client/media/upload/image")
-    create_file("app/api/client/media/upload/image/route.ts")
-    create_directory("app/api/client/media/upload/video")
-    create_file("app/api/client/media/upload/video/route.ts")
-    create_directory("app/api/client/media/upload/audio")
-    create_file("app/api/client/media/upload/audio/route.ts")
-    create_directory("app/api/client/media/upload/document")
-    create_file("app/api/client/media/upload/document/route.ts")
-    create_directory("app/api/client/media/upload/voice-note")
-    create_file("app/api/client/media/upload/voice-note/route.ts")
-    create_directory("app/api/client/media/download/[fileId]")
-    create_file("app/api/client/media/download/[fileId]/route.ts")
-    create_directory("app/api/client/media/thumbnail/[fileId]")
-    create_file("app/api/client/media/thumbnail/[fileId]/route.ts")
-    create_directory("app/api/client/media/delete/[fileId]")
-    create_file("app/api/client/media/delete/[fileId]/route.ts")
-    
-    create_directory("app/api/client/calls/initiate")
-    create_file("app/api/client/calls/initiate/route.ts")
-    create_directory("app/api/client/calls/answer")
-    create_file("app/api/client/calls/answer/route.ts")
-    create_directory("app/api/client/calls/reject")
-    create_file("app/api/client/calls/reject/route.ts")
-    create_directory("app/api/client/calls/end")
-    create_file("app/api/client/calls/end/route.ts")
-    create_directory("app/api/client/calls/[callId]/ice-candidates")
-    create_file("app/api/client/calls/[callId]/ice-candidates/route.ts")
-    create_directory("app/api/client/calls/[callId]/offer")
-    create_file("app/api/client/calls/[callId]/offer/route.ts")
-    create_directory("app/api/client/calls/[callId]/answer-sdp")
-    create_file("app/api/client/calls/[callId]/answer-sdp/route.ts")
-    create_directory("app/api/client/calls/[callId]")
-    create_file("app/api/client/calls/[callId]/route.ts")
-    create_directory("app/api/client/calls/turn-credentials")
-    create_file("app/api/client/calls/turn-credentials/route.ts")
-    create_directory("app/api/client/calls/group-call/create")
-    create_file("app/api/client/calls/group-call/create/route.ts")
-    create_directory("app/api/client/calls/group-call/join")
-    create_file("app/api/client/calls/group-call/join/route.ts")
-    create_directory("app/api/client/calls")
-    create_file("app/api/client/calls/route.ts")
-    
-    create_directory("app/api/client/status/[statusId]/view")
-    create_file("app/api/client/status/[statusId]/view/route.ts")
-    create_directory("app/api/client/status/[statusId]/viewers")
-    create_file("app/api/client/status/[statusId]/viewers/route.ts")
-    create_directory("app/api/client/status/[statusId]")
-    create_file("app/api/client/status/[statusId]/route.ts")
-    create_directory("app/api/client/status/my-status")
-    create_file("app/api/client/status/my-status/route.ts")
-    create_directory("app/api/client/status/recent")
-    create_file("app/api/client/status/recent/route.ts")
-    create_directory("app/api/client/status")
-    create_file("app/api/client/status/route.ts")
-    
-    create_directory("app/api/client/notifications/read")
-    create_file("app/api/client/notifications/read/route.ts")
-    create_directory("app/api/client/notifications/settings")
-    create_file("app/api/client/notifications/settings/route.ts")
-    create_directory("app/api/client/notifications/push-token")
-    create_file("app/api/client/notifications/push-token/route.ts")
-    create_directory("app/api/client/notifications")
-    create_file("app/api/client/notifications/route.ts")
-    
-    create_directory("app/api/client/sync/messages")
-    create_file("app/api/client/sync/messages/route.ts")
-    create_directory("app/api/client/sync/chats")
-    create_file("app/api/client/sync/chats/route.ts")
-    create_directory("app/api/client/sync/full")
-    create_file("app/api/client/sync/full/route.ts")
-    
-    create_directory("app/api/admin/auth/login")
-    create_file("app/api/admin/auth/login/route.ts")
-    create_directory("app/api/admin/auth/logout")
-    create_file("app/api/admin/auth/logout/route.ts")
-    create_directory("app/api/admin/auth/verify")
-    create_file("app/api/admin/auth/verify/route.ts")
-    
-    create_directory("app/api/admin/dashboard/stats")
-    create_file("app/api/admin/dashboard/stats/route.ts")
-    create_directory("app/api/admin/dashboard/analytics")
-    create_file("app/api/admin/dashboard/analytics/route.ts")
-    create_directory("app/api/admin/dashboard/system-health")
-    create_file("app/api/admin/dashboard/system-health/route.ts")
-    
-    create_directory("app/api/admin/users/[userId]/ban")
-    create_file("app/api/admin/users/[userId]/ban/route.ts")
-    create_directory("app/api/admin/users/[userId]/unban")
-    create_file("app/api/admin/users/[userId]/unban/route.ts")
-    create_directory("app/api/admin/users/[userId]/chats")
-    create_file("app/api/admin/users/[userId]/chats/route.ts")
-    create_directory("app/api/admin/users/[userId]/activity")
-    create_file("app/api/admin/users/[userId]/activity/route.ts")
-    create_directory("app/api/admin/users/[userId]")
-    create_file("app/api/admin/users/[userId]/route.ts")
-    create_directory("app/api/admin/users/search")
-    create_file("app/api/admin/users/search/route.ts")
-    create_directory("app/api/admin/users/bulk-actions")
-    create_file("app/api/admin/users/bulk-actions/route.ts")
-    create_directory("app/api/admin/users/export")
-    create_file("app/api/admin/users/export/route.ts")
-    create_directory("app/api/admin/users")
-    create_file("app/api/admin/users/route.ts")
-    
-    create_directory("app/api/admin/messages/[messageId]/flag")
-    create_file("app/api/admin/messages/[messageId]/flag/route.ts")
-    create_directory("app/api/admin/messages/[messageId]")
-    create_file("app/api/admin/messages/[messageId]/route.ts")
-    create_directory("app/api/admin/messages/reported")
-    create_file("app/api/admin/messages/reported/route.ts")
-    create_directory("app/api/admin/messages/search")
-    create_file("app/api/admin/messages/search/route.ts")
-    create_directory("app/api/admin/messages/analytics")
-    create_file("app/api/admin/messages/analytics/route.ts")
-    create_directory("app/api/admin/messages")
-    create_file("app/api/admin/messages/route.ts")
-    
-    create_directory("app/api/admin/groups/[groupId]/members")
-    create_file("app/api/admin/groups/[groupId]/members/route.ts")
-    create_directory("app/api/admin/groups/[groupId]/messages")
-    create_file("app/api/admin/groups/[groupId]/messages/route.ts")
-    create_directory("app/api/admin/groups/[groupId]")
-    create_file("app/api/admin/groups/[groupId]/route.ts")
-    create_directory("app/api/admin/groups/analytics")
-    create_file("app/api/admin/groups/analytics/route.ts")
-    create_directory("app/api/admin/groups")
-    create_file("app/api/admin/groups/route.ts")
-    
-    create_directory("app/api/admin/media/[fileId]")
-    create_file("app/api/admin/media/[fileId]/route.ts")
-    create_directory("app/api/admin/media/storage")
-    create_file("app/api/admin/media/storage/route.ts")
-    create_directory("app/api/admin/media/cleanup")
-    create_file("app/api/admin/media/cleanup/route.ts")
-    create_directory("app/api/admin/media")
-    create_file("app/api/admin/media/route.ts")
-    
-    create_directory("app/api/admin/reports/[reportId]/resolve")
-    create_file("app/api/admin/reports/[reportId]/resolve/route.ts")
-    create_directory("app/api/admin/reports/[reportId]")
-    create_file("app/api/admin/reports/[reportId]/route.ts")
-    create_directory("app/api/admin/reports/types")
-    create_file("app/api/admin/reports/types/route.ts")
-    create_directory("app/api/admin/reports")
-    create_file("app/api/admin/reports/route.ts")
-    
-    create_directory("app/api/admin/settings/system")
-    create_file("app/api/admin/settings/system/route.ts")
-    create_directory("app/api/admin/settings/notifications")
-    create_file("app/api/admin/settings/notifications/route.ts")
-    create_directory("app/api/admin/settings/security")
-    create_file("app/api/admin/settings/security/route.ts")
-    create_directory("app/api/admin/settings/maintenance")
-    create_file("app/api/admin/settings/maintenance/route.ts")
-    
-    create_directory("app/api/admin/logs/errors")
-    create_file("app/api/admin/logs/errors/route.ts")
-    create_directory("app/api/admin/logs/audit")
-    create_file("app/api/admin/logs/audit/route.ts")
-    create_directory("app/api/admin/logs/export")
-    create_file("app/api/admin/logs/export/route.ts")
-    create_directory("app/api/admin/logs")
-    create_file("app/api/admin/logs/route.ts")
-    
-    create_directory("app/api/admin/backup/create")
-    create_file("app/api/admin/backup/create/route.ts")
-    create_directory("app/api/admin/backup/restore")
-    create_file("app/api/admin/backup/restore/route.ts")
-    create_directory("app/api/admin/backup/list")
-    create_file("app/api/admin/backup/list/route.ts")
-    
-    create_directory("app/api/webhook/smtp")
-    create_file("app/api/webhook/smtp/route.ts")
-    create_directory("app/api/webhook/push-notifications")
-    create_file("app/api/webhook/push-notifications/route.ts")
-    create_directory("app/api/webhook/payment")
-    create_file("app/api/webhook/payment/route.ts")
-    
-    create_directory("app/api/health")
-    create_file("app/api/health/route.ts")
-    
-    create_file("app/globals.css")
-    
-    # Lib directory and its subdirectories
-    create_directory("lib/auth")
-    create_file("lib/auth/jwt.ts")
-    create_file("lib/auth/otp.ts")
-    create_file("lib/auth/qr-auth.ts")
-    create_file("lib/auth/middleware.ts")
-    
-    create_directory("lib/database/models")
-    create_file("lib/database/models/user.ts")
-    create_file("lib/database/models/chat.ts")
-    create_file("lib/database/models/message.ts")
-    create_file("lib/database/models/group.ts")
-    create_file("lib/database/models/media.ts")
-    create_file("lib/database/models/call.ts")
-    create_file("lib/database/models/status.ts")
-    create_file("lib/database/models/notification.ts")
-    create_file("lib/database/models/report.ts")
-    create_file("lib/database/models/admin.ts")
-    
-    create_directory("lib/database/schemas")
-    create_file("lib/database/schemas/user.ts")
-    create_file("lib/database/schemas/message.ts")
-    create_file("lib/database/schemas/auth.ts")
-    create_file("lib/database/schemas/media.ts")
-    create_file("lib/database/schemas/group.ts")
-    create_file("lib/database/schemas/call.ts")
-    
-    create_directory("lib/database/repositories")
-    create_file("lib/database/repositories/user.ts")
-    create_file("lib/database/repositories/chat.ts")
-    create_file("lib/database/repositories/message.ts")
-    create_file("lib/database/repositories/group.ts")
-    create_file("lib/database/repositories/media.ts")
-    create_file("lib/database/repositories/call.ts")
-    create_file("lib/database/repositories/status.ts")
-    
-    create_file("lib/database/mongodb.ts")
-    
-    create_directory("lib/realtime/events")
-    create_file("lib/realtime/events/messaging.ts")
-    create_file("lib/realtime/events/presence.ts")
-    create_file("lib/realtime/events/typing.ts")
-    create_file("lib/realtime/events/calls.ts")
-    create_file("lib/realtime/events/groups.ts")
-    
-    create_directory("lib/realtime/middleware")
-    create_file("lib/realtime/middleware/auth.ts")
-    create_file("lib/realtime/middleware/rate-limit.ts")
-    
-    create_file("lib/realtime/socket.ts")
-    
-    create_directory("lib/media")
-    create_file("lib/media/s3.ts")
-    create_file("lib/media/upload.ts")
-    create_file("lib/media/compression.ts")
-    create_file("lib/media/thumbnail.ts")
-    create_file("lib/media/validation.ts")
-    
-    create_directory("lib/communication/templates")
-    create_file("lib/communication/templates/email.ts")
-    create_file("lib/communication/templates/sms.ts")
-    
-    create_file("lib/communication/smtp.ts")
-    create_file("lib/communication/sms.ts")
-    create_file("lib/communication/push-notifications.ts")
-    
-    create_directory("lib/webrtc")
-    create_file("lib/webrtc/coturn.ts")
-    create_file("lib/webrtc/signaling.ts")
-    create_file("lib/webrtc/ice-candidates.ts")
-    create_file("lib/webrtc/call-manager.ts")
-    
-    create_directory("lib/security")
-    create_file("lib/security/encryption.ts")
-    create_file("lib/security/rate-limiting.ts")
-    create_file("lib/security/validation.ts")
-    create_file("lib/security/sanitization.ts")
-    create_file("lib/security/permissions.ts")
-    
-    create_directory("lib/utils")
-    create_file("lib/utils/constants.ts")
-    create_file("lib/utils/helpers.ts")
-    create_file("lib/utils/date.ts")
-    create_file("lib/utils/crypto.ts")
-    create_file("lib/utils/pagination.ts")
-    create_file("lib/utils/error-handler.ts")
-    
-    create_directory("lib/monitoring")
-    create_file("lib/monitoring/analytics.ts")
-    create_file("lib/monitoring/logging.ts")
-    create_file("lib/monitoring/metrics.ts")
-    create_file("lib/monitoring/health-check.ts")
-    
-    create_directory("lib/config")
-    create_file("lib/config/environment.ts")
-    create_file("lib/config/database.ts")
-    create_file("lib/config/redis.ts")
-    create_file("lib/config/cors.ts")
-    create_file("lib/config/rate-limits.ts")
-    
-    # Root files
-    create_file("middleware.ts")
-    create_file("next.config.js")
-    create_file("package.json")
-    create_file("tsconfig.json")
+    try:
+        root_fd = os.open(target, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+        try:
+            build_tree(target, root_fd, levels, files, fresh)
+            create_file(DONE_MARKER, dir_fd=root_fd)
+        finally:
+            os.close(root_fd)
+        if target != ROOT:
+            os.rename(target, ROOT)
+    except BaseException:
+        if target != ROOT:
+            shutil.rmtree(target, ignore_errors=True)
+        raise
 
 if __name__ == "__main__":
     create_project_structure()
-    print("Project structure created successfully!")
\ No newline at end of file
+    print("Project structure created successfully!")